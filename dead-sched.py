@@ -1,30 +1,170 @@
-from anyascii import anyascii
+import time
+# start of the script and import timings for --startup-profile
+STARTED = time.perf_counter()
+IMPORT_TIMES = []
+
 import argparse
+IMPORT_TIMES.append(("argparse", time.perf_counter() - STARTED))
+
+_imported = time.perf_counter()
+import atexit
 import csv
 import datetime
+import glob
 import json
 import os
-import platform
 
 import re
-import subprocess
 import sys
-from logging import getLogger, StreamHandler, FileHandler, Formatter
-
-import pprint
+IMPORT_TIMES.append(("standard library", time.perf_counter() - _imported))
 
+_imported = time.perf_counter()
+from anyascii import anyascii
+IMPORT_TIMES.append(("anyascii", time.perf_counter() - _imported))
+
+_imported = time.perf_counter()
+from logging import getLogger, Handler, StreamHandler, FileHandler, Formatter, DEBUG, INFO, WARNING
+IMPORT_TIMES.append(("logging", time.perf_counter() - _imported))
+
+# imported by external_execute on first use
+subprocess = None
+
+
+# rules used to classify the workers, can be overridden for the simulation by --policy json files
+DEFAULT_POLICY = {
+    'name': 'default',
+    # team csv statuses (lowercase) considered inactive, workstation is free for rendering
+    'inactive_statuses': ["", "paused", "off", "closed"],
+    # worker comments, first letter of the comment decides if the worker is enabled
+    'comments': {
+        'r': 'Render Node',
+        'im': 'Ignore - Machine',
+        'f': 'Free Workstation',
+        'iu': 'Ignore - User',
+        'fnt': 'Free Workstation - User not found in team',
+        'w': 'Workstation in use during working hours',
+        'p': 'Paused - User not active',
+    },
+    # first letters of comments of workers to be enabled, 'w' is added by --workstations_render
+    'enabled_firsts': ['f', 'p', 'r'],
+    # hours [start, end) when workstations are not rendering, used only by the simulation
+    'working_hours': [9, 18],
+}
+
+def load_policy(path):
+    """
+    Reads policy json file. Missing keys are taken from DEFAULT_POLICY,
+    comments are merged with the default comments.
+
+    :raises ValueError: if the policy is not valid
+    """
+    with open(path, "r", encoding="utf-8") as json_file:
+        overrides = json.load(json_file)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"Policy in {path} is not a json object")
+    policy = dict(DEFAULT_POLICY)
+    policy['name'] = os.path.splitext(os.path.basename(path))[0]
+    for key, value in overrides.items():
+        if key not in DEFAULT_POLICY:
+            raise ValueError(f"Unknown policy key '{key}' in {path}")
+        if key == 'name':
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"Policy name in {path} must be a non-empty string")
+        elif key in ('inactive_statuses', 'enabled_firsts'):
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"Policy {key} in {path} must be a list of strings")
+        elif key == 'working_hours':
+            if (not isinstance(value, list) or len(value) != 2
+                    or not all(isinstance(hour, int) and not isinstance(hour, bool) for hour in value)
+                    or not 0 <= value[0] <= value[1] <= 24):
+                raise ValueError(f"Policy working_hours in {path} must be [start, end] hours, 0 <= start <= end <= 24")
+        elif key == 'comments':
+            if not isinstance(value, dict):
+                raise ValueError(f"Policy comments in {path} must be a json object")
+            for category, comment in value.items():
+                if not isinstance(comment, str) or not comment:
+                    raise ValueError(f"Policy comment '{category}' in {path} must be a non-empty string")
+            value = dict(DEFAULT_POLICY['comments'], **value)
+        policy[key] = value
+    return policy
+
+def parse_shift_time(value):
+    """
+    Converts shift time HH:MM from the team csv to minutes from midnight.
+
+    :return: minutes from midnight, or None for empty value
+    :raises ValueError: if the value is not a valid time
+    """
+    value = value.strip()
+    if not value:
+        return None
+    shift_time = datetime.datetime.strptime(value, "%H:%M")
+    return shift_time.hour * 60 + shift_time.minute
+
+class TeamMember:
+    """
+    Compact record of one person from the team csv files.
+    Shift start and end are minutes from midnight, None means the whole day.
+    Shift ending before it starts runs over midnight, shift ending when it starts is the whole day.
+    """
+    __slots__ = ('active', 'shift_start', 'shift_end')
+
+    def __init__(self, active, shift_start=None, shift_end=None):
+        self.active = active
+        self.shift_start = shift_start
+        self.shift_end = shift_end
+
+    def is_active(self, minute=None):
+        """
+        :param minute: minutes from midnight, None to ignore the shift
+        """
+        if not self.active:
+            return False
+        if minute is None or self.shift_start is None or self.shift_start == self.shift_end:
+            return True
+        if self.shift_start < self.shift_end:
+            return self.shift_start <= minute < self.shift_end
+        return minute >= self.shift_start or minute < self.shift_end
 
-def get_worker_info_folder():
-    def get_current_folder():
-        # Get the current file location, even if the script is frozen (e.g., built with pyinstaller)
-        if getattr(sys, 'frozen', False):
-            # If the application is run as a frozen executable
-            current_file_location = sys.executable
-        else:
-            # If the application is run in a standard Python environment
-            current_file_location = os.path.abspath(__file__)
-        current_file_location = os.path.dirname(current_file_location)
-        return current_file_location
+    def merge(self, other):
+        """
+        Resolves duplicate records of the same person, independent of the order of the rows.
+        Active wins over inactive, and the widest shift wins (whole day over a shift),
+        so a duplicate never takes the workstation from an active artist.
+        Two shifts are merged to one span from the earliest start to the latest end,
+        so the gap of a split shift counts as active. Shift over midnight makes it the whole day.
+        """
+        if self.active != other.active:
+            return self if self.active else other
+        if not self.active or self.shift_start is None:
+            return self
+        if other.shift_start is None:
+            return other
+        if self.shift_start <= self.shift_end and other.shift_start <= other.shift_end:
+            return TeamMember(True, min(self.shift_start, other.shift_start), max(self.shift_end, other.shift_end))
+        return TeamMember(True)
+
+def get_current_folder():
+    # Get the current file location, even if the script is frozen (e.g., built with pyinstaller)
+    if getattr(sys, 'frozen', False):
+        # If the application is run as a frozen executable
+        current_file_location = sys.executable
+    else:
+        # If the application is run in a standard Python environment
+        current_file_location = os.path.abspath(__file__)
+    current_file_location = os.path.dirname(current_file_location)
+    return current_file_location
+
+def load_setup():
+    """
+    Reads setup.json from the script folder once, the result is shared by the logging and the scheduler.
+    Paths starting with dot are relative to the script folder, missing values get sane defaults.
+
+    :return: dictionary with current_folder, path_team (list), path_ignore_people,
+        path_ignore_workers and worker_info_folder
+    :rtype: dict
+    """
+    current_folder = get_current_folder()
 
     def to_absolute_path(relative):
         if relative.startswith("."):
@@ -32,37 +172,157 @@ def get_worker_info_folder():
         return relative
 
     # set sane defaults
-    current_folder = get_current_folder()
+    path_team = [current_folder]
+    path_ignore_people = current_folder + os.sep + "ignore_people.txt"
+    path_ignore_workers = current_folder + os.sep + "ignore_machines.txt"
     worker_info_folder = current_folder + os.sep + "worker_info"
 
     # now try to read it from setup.json
     try:
         with open(current_folder + os.sep + "setup.json", "r") as json_file:
             setup = json.load(json_file)
+            path_team = setup.get("path_team", path_team)
+            path_ignore_people = setup.get("path_ignore_people", path_ignore_people)
+            path_ignore_people = to_absolute_path(path_ignore_people)
+            path_ignore_workers = setup.get("path_ignore_workers", path_ignore_workers)
+            path_ignore_workers = to_absolute_path(path_ignore_workers)
             worker_info_folder = setup.get("worker_info_folder", worker_info_folder)
             worker_info_folder = to_absolute_path(worker_info_folder).replace("\\", "/")
     except:
         pass
-    return worker_info_folder
 
-def make_logging(lvl):
+    # path_team is a folder or a glob pattern, or a list of them
+    if isinstance(path_team, str):
+        path_team = [path_team]
+    team_sources = []
+    for source in path_team:
+        source = to_absolute_path(source).replace("\\", "/")
+        if source.endswith("/"):
+            source = source[:-1]
+        team_sources.append(source)
+    if worker_info_folder.endswith("/"):
+        worker_info_folder = worker_info_folder[:-1]
+
+    return {
+        'current_folder': current_folder,
+        'path_team': team_sources,
+        'path_ignore_people': path_ignore_people,
+        'path_ignore_workers': path_ignore_workers,
+        'worker_info_folder': worker_info_folder,
+    }
+
+class StartupProfile:
+    """
+    Collects timings of the startup phases, printed by --startup-profile.
+    """
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.marks = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.marks.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = ["Startup profile:", "imports:"]
+        for module, seconds in IMPORT_TIMES:
+            lines.append(f"  {module:<32}{seconds * 1000:>10.1f} ms")
+        lines.append("phases (including the lazy imports):")
+        for phase, seconds in self.marks:
+            lines.append(f"{phase:<34}{seconds * 1000:>10.1f} ms")
+        lines.append(f"{'total':<34}{(self.last - self.started) * 1000:>10.1f} ms")
+        return "\n".join(lines)
+
+class LazyQueueHandler(Handler):
+    """
+    Puts records to the queue as they are, message formatting is left to the background writer.
+    """
+    def __init__(self, log_queue):
+        super().__init__()
+        self.queue = log_queue
+
+    def emit(self, record):
+        self.queue.put_nowait(record)
+
+class JsonLinesFormatter(Formatter):
+    """
+    Formats event records (logged with extra event and fields) as one json object per line.
+    """
+    def format(self, record):
+        event = {'time': self.formatTime(record, "%Y-%m-%dT%H:%M:%S"), 'event': record.event}
+        event.update(record.fields)
+        return json.dumps(event)
+
+def is_event(record):
+    return hasattr(record, 'event')
+
+def is_not_event(record):
+    return not hasattr(record, 'event')
+
+def make_logging(lvl, worker_info_folder=None, background=True):
+    """
+    Logs to the console, the YYMMDD.log and the YYMMDD_events.jsonl (structured events,
+    see WorkerSchedule.event). With background, logging is asynchronous, the loggers only
+    put records to a queue and a background listener writes them. --simulate doesn't run
+    any Deadline operations, it logs directly and skips importing the queue listener.
+    Calling it again returns the same logger.
+    """
     lvls = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
     lvl = lvl.upper()
     if lvl not in lvls:
         lvl = "WARNING"
 
     logger = getLogger(__name__)
+    logger.setLevel(lvl)
+    if logger.handlers:
+        return logger
+
     handler = StreamHandler()
     handler.setLevel(lvl)
-    logger.setLevel(lvl)
-    logger.addHandler(handler)
+    handler.addFilter(is_not_event)
 
-    fh = FileHandler(get_worker_info_folder() + os.sep + datetime.datetime.now().strftime("%y%m%d") + ".log")
+    if worker_info_folder is None:
+        worker_info_folder = load_setup()['worker_info_folder']
+    os.makedirs(worker_info_folder, exist_ok=True)
+    today = datetime.datetime.now().strftime("%y%m%d")
+    fh = FileHandler(worker_info_folder + os.sep + today + ".log", encoding="utf-8")
     formatter = Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
+    fh.setFormatter(formatter)
     fh.setLevel("DEBUG")
-    logger.addHandler(fh)
+    fh.addFilter(is_not_event)
+
+    eh = FileHandler(worker_info_folder + os.sep + today + "_events.jsonl", encoding="utf-8", delay=True)
+    eh.setFormatter(JsonLinesFormatter())
+    eh.addFilter(is_event)
+
+    events = getLogger(__name__ + ".events")
+    events.setLevel(INFO)
+    events.propagate = False
+
+    if not background:
+        for h in (handler, fh):
+            logger.addHandler(h)
+        events.addHandler(eh)
+        return logger
+
+    # imported only for the background writer, --simulate doesn't need it
+    imported = time.perf_counter()
+    import queue
+    import logging.handlers
+    IMPORT_TIMES.append(("queue, logging.handlers (lazy)", time.perf_counter() - imported))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, fh, eh, respect_handler_level=True)
+    listener.start()
+    # flush the queue before the interpreter exits
+    atexit.register(listener.stop)
+
+    logger.addHandler(LazyQueueHandler(log_queue))
+    events.addHandler(LazyQueueHandler(log_queue))
 
     return logger
 
@@ -70,17 +330,23 @@ def get_deadline_executable():
     pth = None
     if os.environ.get("DEADLINE_PATH", None):
         pth = os.environ["DEADLINE_PATH"] + os.sep + "deadlinecommand"
-        if platform.system() == "Windows":
+        if sys.platform == "win32":
             pth += ".exe"
     return pth.replace("\\", "/") if pth else None
 
 def external_execute(args):
+    # imported on first use, --simulate never runs deadlinecommand
+    global subprocess
+    if subprocess is None:
+        imported = time.perf_counter()
+        import subprocess
+        IMPORT_TIMES.append(("subprocess (lazy)", time.perf_counter() - imported))
     kwargs = {
         "stdout": subprocess.PIPE,
         "stderr": subprocess.PIPE,
         "text": True  # Automatically decodes to string
     }
-    if platform.system().lower() == "windows":
+    if sys.platform == "win32":
         kwargs["creationflags"] = (
                 subprocess.CREATE_NEW_PROCESS_GROUP
                 | getattr(subprocess, "DETACHED_PROCESS", 0)
@@ -102,8 +368,129 @@ def external_execute(args):
 
     return popen_stdout, popen_stderr, popen.returncode
 
+class OperationJournal:
+    """
+    Append-only journal of Deadline operations (worker, setting, value, result) of one run.
+
+    Each line is a json record. All planned operations are written and synced before
+    anything is applied, completed operations are appended as they finish.
+    Every record is flushed to the OS right away, so a killed process loses nothing.
+    To keep the journal off the critical path, the file is fsync'd only every
+    `sync_every` records and on close. Losing the unsynced records in an OS crash
+    only means those operations are applied once more on --resume.
+    The journal is removed when all its operations completed successfully.
+    """
+    filename_pattern = r"^(\d{6}_\d{6})_journal\.jsonl$"
+
+    def __init__(self, folder, sync_every=64):
+        self.path = folder + os.sep + datetime.datetime.now().strftime("%y%m%d_%H%M%S") + "_journal.jsonl"
+        self.sync_every = sync_every
+        self._unsynced = 0
+        self._pending = set()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def plan(self, operations):
+        for worker, setting, value in operations:
+            self._write({'op': 'planned', 'worker': worker, 'setting': setting, 'value': value})
+            self._pending.add((worker, setting, value))
+        # planned operations must be on disk before the first one is applied
+        self.sync()
+
+    def done(self, worker, setting, value, return_code):
+        self._write({'op': 'done', 'worker': worker, 'setting': setting, 'value': value, 'result': return_code})
+        if return_code == 0:
+            self._pending.discard((worker, setting, value))
+
+    def close(self):
+        """
+        Syncs and closes the journal, it is removed if there is nothing left to resume.
+        """
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+            if not self._pending:
+                os.remove(self.path)
+
+    @classmethod
+    def remove_journals(cls, folder):
+        """
+        Removes all journals in the folder, ie. when a new full run supersedes them.
+        """
+        try:
+            filenames = os.listdir(folder)
+        except OSError:
+            return
+        for filename in filenames:
+            if re.match(cls.filename_pattern, filename):
+                try:
+                    os.remove(folder + os.sep + filename)
+                except OSError:
+                    pass
+
+    @classmethod
+    def journal_time(cls, path):
+        """
+        :return: datetime of the journal from its file name
+        :rtype: datetime.datetime
+        """
+        match = re.match(cls.filename_pattern, os.path.basename(path))
+        return datetime.datetime.strptime(match.group(1), "%y%m%d_%H%M%S")
+
+    @classmethod
+    def last_journal(cls, folder):
+        """
+        Returns the path of the most recent journal in the folder, or None.
+        """
+        journals = []
+        try:
+            for filename in os.listdir(folder):
+                if re.match(cls.filename_pattern, filename):
+                    journals.append(filename)
+        except OSError:
+            return None
+        if not journals:
+            return None
+        return folder + os.sep + max(journals)
+
+    @staticmethod
+    def pending_operations(path):
+        """
+        Reads the journal and returns the planned operations that did not complete successfully.
+
+        A truncated last line (process killed while writing) is skipped.
+
+        :return: list of (worker, setting, value) tuples in the planned order
+        :rtype: list
+        """
+        planned = []
+        completed = set()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                operation = (record['worker'], record['setting'], record['value'])
+                if record['op'] == 'planned':
+                    planned.append(operation)
+                elif record['op'] == 'done' and record['result'] == 0:
+                    completed.add(operation)
+        return [operation for operation in planned if operation not in completed]
+
 class WorkerSchedule:
-    def __init__(self, args, logger):
+    def __init__(self, args, logger, setup=None):
         """
         Some arguments to be passed in args:
         {'check': True,
@@ -111,26 +498,40 @@ class WorkerSchedule:
          'dry': False,
          'use_comments': False,
          'workstations_render': False}
+
+        setup is the result of load_setup(), it is loaded again if not passed.
         """
         self.args = args
+        self.setup = setup if setup is not None else load_setup()
+        self.policy = DEFAULT_POLICY
 
         # used to speed up the debug
         # can read cached json file instead of deadline read
         self.skip_reading_from_Deadline = False
 
         self.logger = logger
+        self.events = getLogger(logger.name + ".events")
         self.deadline_path = None
-        self.current_folder = self.get_current_folder()
+        self.current_folder = self.setup['current_folder']
 
-        self.csv_root = None
+        self.team_sources = []
         self.path_ignore_people = None
         self.path_ignore_workers = None
         self.worker_info_folder = None
+        self.journal = None
 
-        # read team data
         self.get_setup()
-        self.current_team_file = None
-        self.get_current_team_file()
+        if self.args.get('resume'):
+            # only finish the operations of the last run, no team data or Deadline read needed
+            self.checks_ok = self.resume_from_journal()
+            return
+
+        # read team data
+        self.current_team_files = []
+        self.get_current_team_files()
+        # minute of the day to decide if artists are in their shift
+        now = datetime.datetime.now()
+        self.team_minute = now.hour * 60 + now.minute
         self.team_data = self.get_current_team_data()
 
         self.checks_ok = self.init_checks()
@@ -162,11 +563,24 @@ class WorkerSchedule:
         # write the result to worker comment in workers_parsed
         self.assign_comment_to_workers()
 
+        # plan all changes to Deadline and journal them before applying, so a crashed run can be resumed
+        comment_operations = self.comment_operations()
+        launch_operations, enable_operations = self.enable_operations()
+        operations = comment_operations + launch_operations + enable_operations
+        if operations:
+            # this run decides everything again, journals of the previous runs are not to be resumed
+            OperationJournal.remove_journals(self.worker_info_folder)
+            self.journal = OperationJournal(self.worker_info_folder)
+            self.journal.plan(operations)
+
         # write the worker comment back to deadline
-        self.comment_to_deadline()
+        self.comment_to_deadline(comment_operations)
 
         # deadline enable or disable workers by the comment, also store in workers_parsed
-        self.slave_enabled_by_comment()
+        self.slave_enabled_by_comment(launch_operations, enable_operations)
+
+        if self.journal:
+            self.journal.close()
 
         # read back enabled / disabled from Deadline, compare to expected and report
         self.check_if_set()
@@ -177,6 +591,13 @@ class WorkerSchedule:
         my_json = self.worker_info_folder + os.sep + datetime.datetime.now().strftime("%y%m%d") + ".json"
         self.worker_info_to_json(my_json)
 
+    def event(self, event, **fields):
+        """
+        Writes structured event to the YYMMDD_events.jsonl.
+        """
+        if self.events.isEnabledFor(INFO):
+            self.events.info(event, extra={'event': event, 'fields': fields})
+
     def str_to_bool(self, s):
         if s == 'True':
             return True
@@ -282,9 +703,9 @@ class WorkerSchedule:
             self.logger.error("Deadline executable not found. Please set DEADLINE_PATH environment variable.")
             checks_ok = False
 
-        if not self.csv_root or not os.path.exists(self.csv_root):
-            self.logger.error(f"Path to CSV root not found. Please set path_team in setup.json to valid path.")
-            checks_ok = False
+        for source in self.team_sources:
+            if not os.path.isdir(source) and not glob.glob(source):
+                self.logger.warning(f"path_team {source} is not a folder and matches no files. Please set path_team in setup.json to valid path.")
         if not self.path_ignore_people or not os.path.exists(self.path_ignore_people):
             self.logger.warning(f"Path to ignore_people.txt not found. Please set path_ignore_people in setup.json to valid path.")
             checks_ok = True
@@ -292,11 +713,11 @@ class WorkerSchedule:
             self.logger.warning(f"Path to ignore_workers.txt not found. Please set path_ignore_workers in setup.json to valid path.")
             checks_ok = True
 
-        if not self.current_team_file or not os.path.exists(os.path.join(self.csv_root, self.current_team_file)):
-            self.logger.error(f"Current team file YYMMDD.csv not found at folder {self.csv_root}")
+        if not self.current_team_files:
+            self.logger.error(f"Current team file YYMMDD.csv not found at {', '.join(self.team_sources)}")
             checks_ok = False
         if not self.team_data or self.team_data == {}:
-            self.logger.error(f"Problem with Current team file  {self.current_team_file}")
+            self.logger.error(f"Problem with Current team files {', '.join(self.current_team_files)}")
             checks_ok = False
 
         if not self.worker_info_folder:
@@ -309,126 +730,134 @@ class WorkerSchedule:
 
         return checks_ok
 
-    def get_current_folder(self):
-        # Get the current file location, even if the script is frozen (e.g., built with pyinstaller)
-        if getattr(sys, 'frozen', False):
-            # If the application is run as a frozen executable
-            current_file_location = sys.executable
-        else:
-            # If the application is run in a standard Python environment
-            current_file_location = os.path.abspath(__file__)
-        current_file_location = os.path.dirname(current_file_location)
-        self.logger.debug(f"Current file location: {current_file_location}")
-        return current_file_location
-
     def get_setup(self):
+        self.team_sources = list(self.setup['path_team'])
+        self.path_ignore_people = self.setup['path_ignore_people']
+        self.path_ignore_workers = self.setup['path_ignore_workers']
+        self.worker_info_folder = self.setup['worker_info_folder']
 
-        def to_absolute_path(relative):
-            if relative.startswith("."):
-                relative = self.current_folder + relative[1:]
-            return relative
-
-        # set sane defaults
-        self.csv_root = self.current_folder
-        self.path_ignore_people = self.current_folder + os.sep + "ignore_people.txt"
-        self.path_ignore_workers = self.current_folder + os.sep + "ignore_machines.txt"
-        self.worker_info_folder = self.current_folder + os.sep + "worker_info"
-
-        # now try to read it from setup.json
-        try:
-            with open(self.current_folder + os.sep + "setup.json", "r") as json_file:
-                setup = json.load(json_file)
-                self.csv_root = setup.get("path_team", self.csv_root)
-                self.csv_root = to_absolute_path(self.csv_root).replace("\\", "/")
-                self.path_ignore_people = setup.get("path_ignore_people", self.path_ignore_people)
-                self.path_ignore_people = to_absolute_path(self.path_ignore_people)
-                self.path_ignore_workers = setup.get("path_ignore_workers", self.path_ignore_workers)
-                self.path_ignore_workers = to_absolute_path(self.path_ignore_workers)
-                self.worker_info_folder = setup.get("worker_info_folder", self.worker_info_folder)
-                self.worker_info_folder = to_absolute_path(self.worker_info_folder).replace("\\", "/")
-        except:
-            pass
-
-        if self.csv_root.endswith("/"):
-            self.csv_root = self.csv_root[:-1]
-        if self.worker_info_folder.endswith("/"):
-            self.worker_info_folder = self.worker_info_folder[:-1]
-
-        self.logger.debug(f"path_team: {self.csv_root}")
+        self.logger.debug(f"Current file location: {self.current_folder}")
+        self.logger.debug(f"path_team: {', '.join(self.team_sources)}")
         self.logger.debug(f"path_ignore_people: {self.path_ignore_people}")
         self.logger.debug(f"path_ignore_workers: {self.path_ignore_workers}")
         self.logger.debug(f"worker_info_folder: {self.worker_info_folder}")
 
-    def get_current_team_file(self):
+    def get_current_team_files(self, today=None):
+        """
+        Finds the team csv files with the date closest to today in all team sources.
+        Source is a folder or a glob pattern. All files of that date are used, so the team
+        can be split to several files like YYMMDD_anim.csv and YYMMDD_comp.csv.
+        """
         # Define the current date
-        today = datetime.datetime.today().date()
+        if today is None:
+            today = datetime.datetime.today().date()
 
-        # Prepare regex pattern to match filenames like 'data YYMMDD.csv'
-        filename_pattern = r"^(\d{6})\.csv$"
+        # Prepare regex pattern to match filenames like 'YYMMDD.csv' or 'YYMMDD_department.csv'
+        filename_pattern = r"^(\d{6})(?:[ _.-].*)?\.csv$"
 
         # Store matched files and parsed dates
         files_with_dates = []
 
-        # Walk through the directory for matching files
-        for filename in os.listdir(self.csv_root):
-            match = re.match(filename_pattern, filename)
-            if match:
-                date_str = match.group(1)  # Extract YYMMDD
-                try:
-                    # Convert to date object
-                    file_date = datetime.datetime.strptime(date_str, "%y%m%d").date()
-                    files_with_dates.append((filename, file_date))
-                except ValueError:
-                    continue
+        for source in self.team_sources:
+            if os.path.isdir(source):
+                paths = glob.glob(source + "/*.csv")
+            else:
+                paths = glob.glob(source)
+            for path in paths:
+                match = re.match(filename_pattern, os.path.basename(path))
+                if match:
+                    date_str = match.group(1)  # Extract YYMMDD
+                    try:
+                        # Convert to date object
+                        file_date = datetime.datetime.strptime(date_str, "%y%m%d").date()
+                        files_with_dates.append((path.replace("\\", "/"), file_date))
+                    except ValueError:
+                        continue
 
-        # Find the file closest to today's date
-        files_with_dates.sort(key=lambda x: abs(x[1] - today))
+        if not files_with_dates:
+            self.current_team_files = []
+            return
 
-        # Return the closest file and its date
-        self.current_team_file = files_with_dates[0][0] if files_with_dates else None
+        # Find the date closest to today's date, older date wins a tie
+        closest = min((abs(file_date - today), file_date) for _path, file_date in files_with_dates)[1]
+        self.current_team_files = sorted({path for path, file_date in files_with_dates if file_date == closest})
 
     def get_current_team_data(self):
         """
-        Parses a CSV file containing team data to map team member names to their
-        active/inactive status.
+        Streams the team CSV files and maps team member names to TeamMember records.
 
-        The function reads a CSV file in the specified root directory to extract
-        the team's current status. If the file does not exist or is invalid, the
-        function returns an empty dictionary. For each row in the CSV file, the
-        name is extracted from the first column, and the status is compared
-        against a predefined list of inactive statuses ("", "paused", "off").
+        Columns are name, status and optional shift start and end (HH:MM).
+        The status is compared against the inactive statuses of the policy
+        ("", "paused", "off", "closed" by default).
+        Duplicate names are merged by TeamMember.merge, so the result doesn't depend
+        on the order of the files or rows. Rows without name or status are reported and skipped,
+        rows with a bad shift are reported and kept for the whole day.
 
-        :return: A dictionary that maps team member names (lowercased) to their
-            active status. The active status is ``True`` if the member is active
-            and ``False`` otherwise. If no valid file is provided, or rows do not
-            meet the expected format, an empty dictionary is returned.
+        :return: A dictionary that maps team member names (lowercased) to TeamMember.
+            If no valid file is provided an empty dictionary is returned.
         :rtype: dict
         """
-        inactive = ["", "paused", "off", "closed"]
-        if not self.current_team_file:
-            return {}
-        csv_path = os.path.join(self.csv_root, self.current_team_file)
-        if not os.path.exists(csv_path):
-            self.logger.error(f"File {csv_path} not found.")
-            return {}
+        inactive = self.policy['inactive_statuses']
         team = {}
-        try:
-            with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-                    try:
-                        name = str(anyascii(row[0]).lower())
-                        status = str(row[1]).lower()
-                        if status in inactive:
-                            team[name] = False
-                        else:
-                            team[name] = True
-                    except:
-                        continue
-        except UnicodeDecodeError:
-            self.logger.error(f"File {csv_path} could not be read with UTF-8 encoding.")
+        rejected = 0
+        ignored_shifts = 0
+        duplicates = 0
+        for csv_path in self.current_team_files:
+            if not os.path.exists(csv_path):
+                self.logger.error(f"File {csv_path} not found.")
+                continue
+            try:
+                with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                    reader = csv.reader(f)
+                    for row in reader:
+                        if not row or not any(column.strip() for column in row):
+                            continue
+                        reason = None
+                        if len(row) < 2:
+                            reason = "status column missing"
+                        elif not row[0].strip():
+                            reason = "name is empty"
+                        if reason is not None:
+                            rejected += 1
+                            self.logger.warning("Rejected row %s:%s: %s: %s", csv_path, reader.line_num, reason, row)
+                            continue
+
+                        # bad shift must not drop the artist from the team, keep the row for the whole day
+                        shift_start = shift_end = None
+                        shift_problem = None
+                        try:
+                            shift_start = parse_shift_time(row[2]) if len(row) > 2 else None
+                            shift_end = parse_shift_time(row[3]) if len(row) > 3 else None
+                            if (shift_start is None) != (shift_end is None):
+                                shift_problem = "shift needs both start and end"
+                            elif shift_start is not None and shift_start == shift_end:
+                                shift_problem = "shift starts when it ends"
+                        except ValueError:
+                            shift_problem = "shift time is not HH:MM"
+                        if shift_problem is not None:
+                            shift_start = shift_end = None
+                            ignored_shifts += 1
+                            self.logger.warning("Shift ignored, whole day used %s:%s: %s: %s",
+                                                csv_path, reader.line_num, shift_problem, row)
+
+                        name = str(anyascii(row[0].strip()).lower())
+                        status = row[1].strip().lower()
+                        member = TeamMember(status not in inactive, shift_start, shift_end)
+                        if name in team:
+                            duplicates += 1
+                            member = team[name].merge(member)
+                        team[name] = member
+            except UnicodeDecodeError:
+                self.logger.error(f"File {csv_path} could not be read with UTF-8 encoding.")
+            except csv.Error as e:
+                self.logger.error(f"File {csv_path} could not be parsed: {e}")
+
+        if rejected:
+            self.logger.warning(f"{rejected} rows rejected from team files.")
+        if ignored_shifts:
+            self.logger.warning(f"{ignored_shifts} shifts ignored in team files, whole day used.")
+        if duplicates:
+            self.logger.info(f"{duplicates} duplicate team members merged.")
         return team
 
     def get_workers(self):
@@ -565,18 +994,20 @@ class WorkerSchedule:
                     team_members_not_assigned.remove(info['usr'])
                 except ValueError:
                     pass
-                info['user_active'] = self.team_data[info['usr']]
+                info['user_active'] = self.team_data[info['usr']].is_active(self.team_minute)
                 matched_team_members += 1
             else:
                 worker_user_not_in_team.append(info['usr'])
 
         self.logger.info(f"{matched_team_members} team members matched to workers.")
         if len(team_members_not_assigned) > 0:
-            self.logger.info(f"{len(team_members_not_assigned)} team members not matched to workers:")
-            self.logger.info(pprint.pformat(team_members_not_assigned))
+            self.logger.info(f"{len(team_members_not_assigned)} team members not matched to workers.")
+            if self.logger.isEnabledFor(DEBUG):
+                self.logger.debug("Team members not matched: %s", ", ".join(team_members_not_assigned))
         if len(worker_user_not_in_team) > 0:
-            self.logger.debug(f"{len(worker_user_not_in_team)} worker users not matched to team:")
-            self.logger.debug(pprint.pformat(team_members_not_assigned))
+            self.logger.info(f"{len(worker_user_not_in_team)} worker users not matched to team.")
+            if self.logger.isEnabledFor(DEBUG):
+                self.logger.debug("Worker users not matched: %s", ", ".join(worker_user_not_in_team))
 
 
     def assign_comment_to_workers(self):
@@ -591,15 +1022,7 @@ class WorkerSchedule:
 
         Note that only lowercase sof first letter is used for enabling / disabling the slave
         """
-        comments = {
-            'r': 'Render Node',
-            'im': 'Ignore - Machine',
-            'f': 'Free Workstation',
-            'iu': 'Ignore - User',
-            'fnt': 'Free Workstation - User not found in team',
-            'w': 'Workstation in use during working hours',
-            'p': 'Paused - User not active',
-        }
+        comments = self.policy['comments']
 
         if not self.args['use_comments']:
             self.logger.info("Making Comments by team attendance")
@@ -631,21 +1054,105 @@ class WorkerSchedule:
                         # parsed artist name in team csv states this machine can be used today
                         info['comment'] = comments['p']
 
-    def comment_to_deadline(self):
+    def comment_operations(self):
+        """
+        Plans setting of the worker comments to Deadline.
+
+        :return: list of (worker, setting, value) operations, empty for dry run or use_comments
+        :rtype: list
+        """
+        operations = []
         if not self.args['use_comments']:
             if self.args['dry']:
                 self.logger.info("Dry run, not setting comment to deadline")
-                return
             else:
-                self.logger.info("Setting Comments to Deadline")
                 for worker, info in self.workers_parsed.items():
                     if info['comment'] != '':
-                        cmd = [self.deadline_path, "-SetSlaveSetting", worker, 'SlaveComment', info['comment']]
-                        _out, _err, return_code = external_execute(cmd)
-                        if return_code != 0:
-                            self.logger.error(f"Setting Comment to slave {worker} failed with return code {return_code}")
+                        operations.append((worker, 'SlaveComment', info['comment']))
         else:
             self.logger.debug("Skipping comment to deadline, use_comments argument is set to True")
+        return operations
+
+    def comment_to_deadline(self, operations):
+        if operations:
+            self.logger.info("Setting Comments to Deadline")
+        for worker, setting, value in operations:
+            self.apply_operation(worker, setting, value)
+
+    def apply_operation(self, worker, setting, value):
+        """
+        Runs single planned operation with deadlinecommand and records the result to the journal.
+        LaunchSlave is a remote control command, anything else is a slave setting.
+        """
+        if setting == 'LaunchSlave':
+            self.logger.debug("Launching Slave %s", worker)
+            cmd = [self.deadline_path, "-RemoteControl", worker, 'LaunchSlave']
+        else:
+            cmd = [self.deadline_path, "-SetSlaveSetting", worker, setting, value]
+        started = time.perf_counter()
+        _out, _err, return_code = external_execute(cmd)
+        if self.journal:
+            self.journal.done(worker, setting, value, return_code)
+        self.event('operation', worker=worker, setting=setting, value=value, result=return_code,
+                   seconds=round(time.perf_counter() - started, 3))
+        if return_code != 0:
+            if setting == 'LaunchSlave':
+                self.logger.error("Launching Slave %s failed with return code %s", worker, return_code)
+            elif setting == 'SlaveComment':
+                self.logger.error("Setting Comment to slave %s failed with return code %s", worker, return_code)
+            elif setting == 'SlaveEnabled':
+                self.logger.error("Setting slave %s enabled to %s failed with return code %s", worker, value, return_code)
+            else:
+                self.logger.error("Setting slave %s %s to %s failed with return code %s", worker, setting, value, return_code)
+        return return_code
+
+    def resume_from_journal(self):
+        """
+        Applies the operations of the last journal that did not complete,
+        ie. when the previous run crashed or was killed during the apply phase.
+        Journal not from today is refused unless --resume_old is set,
+        its decisions were made for another day's team.
+        """
+        self.deadline_path = get_deadline_executable()
+        if not self.deadline_path:
+            self.logger.error("Deadline executable not found. Please set DEADLINE_PATH environment variable.")
+            return False
+        last_journal = OperationJournal.last_journal(self.worker_info_folder)
+        if not last_journal:
+            self.logger.error(f"No journal to resume found at folder {self.worker_info_folder}")
+            return False
+        journal_time = OperationJournal.journal_time(last_journal)
+        self.logger.info(f"Last journal {last_journal} is from {journal_time:%Y-%m-%d %H:%M:%S}")
+        if journal_time.date() != datetime.date.today() and not self.args.get('resume_old'):
+            self.logger.error("Journal is not from today, not resuming. Use --resume_old to resume it anyway.")
+            return False
+        try:
+            operations = OperationJournal.pending_operations(last_journal)
+        except (OSError, KeyError) as e:
+            self.logger.error(f"Failed to read journal {last_journal}: {e}")
+            return False
+        if not operations:
+            self.logger.info(f"Nothing to resume, all operations in {last_journal} completed.")
+            if not self.args['dry']:
+                os.remove(last_journal)
+            return True
+
+        self.logger.info(f"Resuming {len(operations)} operations from {last_journal}")
+        if self.args['dry']:
+            self.logger.info("Dry run, not resuming operations")
+            return True
+        self.journal = OperationJournal(self.worker_info_folder)
+        self.journal.plan(operations)
+        # the new journal holds all the pending operations now
+        if self.journal.path != last_journal:
+            os.remove(last_journal)
+        failed = 0
+        for worker, setting, value in operations:
+            if self.apply_operation(worker, setting, value) != 0:
+                failed += 1
+        self.journal.close()
+        self.logger.info(f"Resume finished, {len(operations) - failed} operations succeeded and {failed} failed.")
+        return failed == 0
 
     def check_if_set(self):
         if self.args['check']:
@@ -663,44 +1170,236 @@ class WorkerSchedule:
             self.logger.info(f"Check found {len(matching_workers)} workers set correctly and {len(not_matching_workers)} workers set wrongly.")
 
 
-    def slave_enabled_by_comment(self):
+    def get_enabled_firsts(self, workstations_render):
+        enabled_firsts = list(self.policy['enabled_firsts'])
+        if workstations_render:
+            enabled_firsts.append('w')
+        return enabled_firsts
+
+    def enable_operations(self):
+        """
+        Decides by the first letter of the comment which workers should be enabled
+        and stores it as slave_to_be_enabled in workers_parsed.
 
-        enabled_firsts = ['f', 'p', 'r']
-        disabled_firsts = ['i']
+        :return: tuple of launch operations and enable operations,
+            both empty for dry run or comments_only
+        :rtype: tuple
+        """
         if self.args['workstations_render']:
             self.logger.info("\n-=Enabling Workstations Render=-\n")
-            enabled_firsts.append('w')
         else:
             self.logger.info("\n-=Disabling Workstations Render=-\n")
-            disabled_firsts.append('w')
-
-        # make sure workers are launched first
-        # separate loop to give deadline some time
-        if not self.args['comments_only'] and not self.args['dry']:
-            for worker, info in self.workers_parsed.items():
-                if info['comment'] != '':
-                    first = info['comment'][0].lower()
-                    if first in enabled_firsts:
-                        self.logger.debug(f"Launching Slave {worker}")
-                        cmd = [self.deadline_path, "-RemoteControl", worker, 'LaunchSlave']
-                        _out, _err, return_code = external_execute(cmd)
-                        if return_code != 0:
-                            self.logger.error(f"Launching Slave {worker} failed with return code {return_code}")
+        enabled_firsts = self.get_enabled_firsts(self.args['workstations_render'])
 
-        # now enable the slaves
+        apply = not self.args['comments_only'] and not self.args['dry']
+        launch_operations = []
+        enable_operations = []
         for worker, info in self.workers_parsed.items():
             if info['comment'] != '':
                 first = info['comment'][0].lower()
                 if first in enabled_firsts:
                     slave_enabled = 'True'
+                    # make sure workers are launched first
+                    if apply:
+                        launch_operations.append((worker, 'LaunchSlave', None))
                 else:
                     slave_enabled = 'False'
                 self.workers_parsed[worker]['slave_to_be_enabled'] = self.str_to_bool(slave_enabled)
-                if not self.args['comments_only'] and not self.args['dry']:
-                    cmd = [self.deadline_path, "-SetSlaveSetting", worker, 'SlaveEnabled', slave_enabled]
-                    _out, _err, return_code = external_execute(cmd)
-                    if return_code != 0:
-                        self.logger.error(f"Setting slave {worker} enabled to {slave_enabled} failed with return code {return_code}")
+                self.event('decision', worker=worker, type=info['type'], usr=info['usr'],
+                           user_active=info['user_active'], comment=info['comment'], enabled=slave_enabled == 'True')
+                if apply:
+                    enable_operations.append((worker, 'SlaveEnabled', slave_enabled))
+        return launch_operations, enable_operations
+
+    def slave_enabled_by_comment(self, launch_operations, enable_operations):
+
+        # make sure workers are launched first
+        # separate loop to give deadline some time
+        for worker, setting, value in launch_operations:
+            self.apply_operation(worker, setting, value)
+
+        # now enable the slaves
+        for worker, setting, value in enable_operations:
+            self.apply_operation(worker, setting, value)
+
+class PolicySimulator(WorkerSchedule):
+    def __init__(self, args, logger, policies, setup=None):
+        """
+        Replays archived worker snapshots (YYMMDD.json in worker_info_folder) and team csv files
+        (path_team) through the worker classification with each of the policies.
+        Nothing is read from or written to Deadline.
+
+        Every snapshot is one day. Workstations are rendering outside of the policy working hours
+        as if the script ran with --workstations_render at the end and without it
+        at the start of the working hours.
+        """
+        self.args = dict(args, use_comments=False)
+        self.setup = setup if setup is not None else load_setup()
+        # classification helpers log per run, for every day and policy that would flood the log
+        self.simulation_logger = logger
+        self.logger = getLogger(logger.name + ".simulation")
+        self.logger.setLevel(max(WARNING, logger.getEffectiveLevel()))
+        self.events = getLogger(logger.name + ".events")
+        self.policy = DEFAULT_POLICY
+        self.policies = policies
+        self.current_folder = self.setup['current_folder']
+
+        self.team_sources = []
+        self.path_ignore_people = None
+        self.path_ignore_workers = None
+        self.worker_info_folder = None
+        self.get_setup()
+        self.current_team_files = []
+        # classify by the team status only, shifts are evaluated per hour
+        self.team_minute = None
+
+        self.ignore_people = []
+        self.get_ignored_names()
+        self.ignore_machines = []
+        self.get_ignored_machines()
+
+        self.workers_info = {}
+        self.team_data = {}
+        self.users_to_workers = {}
+        self.workers_parsed = {}
+
+        # per policy totals and last enabled state of each worker to count the flips
+        self.results = {}
+        self.last_enabled = {}
+        # team data by team files and inactive statuses, most days share the same files
+        self.team_cache = {}
+
+    def get_snapshots(self, date_from=None, date_to=None):
+        """
+        :return: list of (date, json path) of worker snapshots in the date range, sorted by date
+        :rtype: list
+        """
+        snapshots = []
+        for filename in os.listdir(self.worker_info_folder):
+            match = re.match(r"^(\d{6})\.json$", filename)
+            if not match:
+                continue
+            try:
+                snapshot_date = datetime.datetime.strptime(match.group(1), "%y%m%d").date()
+            except ValueError:
+                continue
+            if date_from and snapshot_date < date_from:
+                continue
+            if date_to and snapshot_date > date_to:
+                continue
+            snapshots.append((snapshot_date, self.worker_info_folder + os.sep + filename))
+        snapshots.sort()
+        return snapshots
+
+    def run(self, date_from=None, date_to=None):
+        snapshots = self.get_snapshots(date_from, date_to)
+        if not snapshots:
+            self.simulation_logger.error(f"No worker snapshots found at folder {self.worker_info_folder}")
+            return {}
+        self.simulation_logger.info(f"Simulating {len(self.policies)} policies on {len(snapshots)} days.")
+
+        for policy in self.policies:
+            self.results[policy['name']] = {
+                'days': 0,
+                'worker_days': 0,
+                'render_hours': 0,
+                'conflict_hours': 0,
+                'churn': 0,
+            }
+
+        for snapshot_date, snapshot in snapshots:
+            try:
+                with open(snapshot, "r") as json_file:
+                    self.workers_info = json.load(json_file)
+            except (OSError, ValueError) as e:
+                self.simulation_logger.warning(f"Failed to read worker snapshot {snapshot}: {e}")
+                continue
+            self.get_current_team_files(snapshot_date)
+            if not self.current_team_files:
+                self.simulation_logger.warning(f"No team file for {snapshot_date}, skipping.")
+                continue
+
+            for policy in self.policies:
+                self.policy = policy
+                team_key = (tuple(self.current_team_files), tuple(policy['inactive_statuses']))
+                if team_key not in self.team_cache:
+                    self.team_cache[team_key] = self.get_current_team_data()
+                self.team_data = self.team_cache[team_key]
+                try:
+                    self.users_to_workers, self.workers_parsed = self.parse_description_from_info()
+                except (KeyError, ValueError) as e:
+                    self.simulation_logger.warning(f"Worker snapshot {snapshot} is incomplete: {e}")
+                    break
+                self.assign_team_member_to_worker_by_name()
+                self.assign_comment_to_workers()
+                self.evaluate_day(policy)
+
+        return self.results
+
+    def evaluate_day(self, policy):
+        """
+        Adds render hours, artist conflict hours and enable/disable flips of the workers_parsed
+        for one day to the policy results.
+        Conflict hour is an hour when workstation of active artist is rendering, in the artist's
+        shift if the team csv has it, otherwise in the working hours.
+        Artists with a shift are classified again every hour (in use while in shift,
+        paused otherwise), as the script would do when run during that hour.
+        """
+        result = self.results[policy['name']]
+        result['days'] += 1
+        result['worker_days'] += len(self.workers_parsed)
+
+        start, end = policy['working_hours']
+        working_hours = [start <= hour < end for hour in range(24)]
+        enabled_working = self.get_enabled_firsts(False)
+        enabled_off_hours = self.get_enabled_firsts(True)
+        in_use_first = policy['comments']['w'][0].lower()
+        paused_first = policy['comments']['p'][0].lower()
+
+        for worker, info in self.workers_parsed.items():
+            comment = info['comment'] or ''
+            first = comment[0].lower() if comment else ''
+            artist_active = info['type'] == 'W' and info['is_artist'] and info['user_active']
+            member = self.team_data.get(info['usr']) if info['team_user_found'] else None
+            if member is None or member.shift_start is None or info['type'] != 'W':
+                member = None
+            key = (policy['name'], worker)
+            last = self.last_enabled.get(key)
+            for hour, working in enumerate(working_hours):
+                if member is not None:
+                    artist_active = member.is_active(hour * 60)
+                    if first in (in_use_first, paused_first):
+                        first = in_use_first if artist_active else paused_first
+                if not first:
+                    # worker without comment is not touched by the script
+                    enabled = info['read_enabled']
+                elif working:
+                    enabled = first in enabled_working
+                else:
+                    enabled = first in enabled_off_hours
+                if enabled:
+                    result['render_hours'] += 1
+                    if artist_active and (working or member is not None):
+                        result['conflict_hours'] += 1
+                if last is not None and enabled != last:
+                    result['churn'] += 1
+                last = enabled
+            self.last_enabled[key] = last
+
+    def report(self):
+        lines = [f"{'policy':<24}{'days':>8}{'worker days':>14}{'render hours':>14}{'conflict hours':>16}{'churn':>8}"]
+        for name, result in self.results.items():
+            lines.append(
+                f"{name:<24}{result['days']:>8}{result['worker_days']:>14}{result['render_hours']:>14}"
+                f"{result['conflict_hours']:>16}{result['churn']:>8}"
+            )
+        return "\n".join(lines)
+
+def yymmdd_date(value):
+    try:
+        return datetime.datetime.strptime(value, "%y%m%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a date in form YYMMDD")
 
 def get_args():
     parser = argparse.ArgumentParser(description="Uses DeadlineCommand to control if slaves are enabled or not.\nReads team attendance csv and exceptions (machines and users to be skipped) sets the Deadline comments accordingly, and enables or disables Deadline workers by the comments")
@@ -744,20 +1443,100 @@ def get_args():
     )
     parser.set_defaults(check=True)
 
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Apply only the operations of the last journal that did not complete (after crashed or killed run).",
+        required=False
+    )
+    parser.set_defaults(resume=False)
+
+    parser.add_argument(
+        '--resume_old',
+        action='store_true',
+        help="With --resume, resume the last journal even if it is not from today.",
+        required=False
+    )
+    parser.set_defaults(resume_old=False)
+
+    parser.add_argument(
+        '--simulate',
+        action='store_true',
+        help="Replay archived worker snapshots and team csv files through the policies, without Deadline.",
+        required=False
+    )
+    parser.set_defaults(simulate=False)
+
+    parser.add_argument(
+        '--simulate_from',
+        default=None,
+        type=yymmdd_date,
+        help="First day (YYMMDD) of the simulation. Defaults to the oldest worker snapshot."
+    )
+
+    parser.add_argument(
+        '--simulate_to',
+        default=None,
+        type=yymmdd_date,
+        help="Last day (YYMMDD) of the simulation. Defaults to the newest worker snapshot."
+    )
+
+    parser.add_argument(
+        '--policy',
+        action='append',
+        default=[],
+        help="Policy json file to simulate along the default policy. Can be used multiple times."
+    )
+
+    parser.add_argument(
+        '--startup_profile',
+        '--startup-profile',
+        action='store_true',
+        help="Print timings of imports and initialization phases.",
+        required=False
+    )
+    parser.set_defaults(startup_profile=False)
+
     parser.add_argument(
         '-log',
         '--log_level',
-        default='DEBUG',
+        default='INFO',
         help='Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)'
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # the default policy is always simulated as the baseline
+    args.policies = [DEFAULT_POLICY]
+    for policy_path in args.policy:
+        try:
+            args.policies.append(load_policy(policy_path))
+        except (OSError, ValueError) as e:
+            parser.error(f"Failed to load policy {policy_path}: {e}")
+
+    return args
 
 if __name__ == "__main__":
 
+    profile = StartupProfile(STARTED)
+    profile.mark("imports")
     args = vars(get_args())
-    log = make_logging(args['log_level'])
-    ws = WorkerSchedule(args, log)
+    profile.mark("arguments")
+    setup = load_setup()
+    profile.mark("setup.json")
+    background = not args['simulate']
+    log = make_logging(args['log_level'], setup['worker_info_folder'], background)
+    profile.mark("logging")
+    if args['simulate']:
+        sim = PolicySimulator(args, log, args['policies'], setup)
+        if sim.run(args['simulate_from'], args['simulate_to']):
+            print(sim.report())
+        profile.mark("simulation")
+    else:
+        ws = WorkerSchedule(args, log, setup)
+        profile.mark("scheduler")
+    if args['startup_profile']:
+        print(profile.report(), file=sys.stderr)
 
 
 